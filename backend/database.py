@@ -14,8 +14,21 @@ DATABASE_URL = os.getenv(
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
-    future=True
+    echo=os.getenv("SQL_ECHO") == "1",  # Statement logging is opt-in; it is expensive per query
+    future=True,
+    # pool_size + max_overflow should roughly match the peak number of
+    # concurrent requests touching the DB (battle polling + uploads)
+    pool_size=20,
+    max_overflow=40,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_use_lifo=True,  # Reuse the hottest connections so server-side caches stay warm
+    query_cache_size=1200,  # Enlarge the compiled-statement cache (default 500)
+    connect_args={
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 256,
+    },
 )
 
 # Create session factory
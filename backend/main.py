@@ -5,22 +5,37 @@ API server for debate practice application
 from dotenv import load_dotenv
 load_dotenv()  # Load environment variables from .env file
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
-import uuid
-import random
+from datetime import date
+import asyncio
+import hashlib
 import os
+import random
+import re
+import time
+import uuid
+
+import aiofiles
+import aiofiles.tempfile
+import orjson
 
-from database import get_db, init_db
+from sqlalchemy import select, update, func, case, cast, bindparam, Numeric
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, joinedload, raiseload, undefer
+
+from database import get_db, init_db, engine, AsyncSessionLocal
 from models import (
     Session as DebateSession, 
     Segment, 
     Scorecard, 
     Topic, 
     User,
+    UserStats,
     Battle,
     BattleSegment
 )
@@ -32,7 +47,7 @@ from schemas import (
     ScoreBreakdown,
     TopicResponse
 )
-from services.gemini_service import GeminiService
+from services.gemini_service import get_gemini_service
 from services.storage_service import StorageService
 from services.stt_service import STTService
 from services.auth_service import (
@@ -54,7 +69,8 @@ app = FastAPI(
     title="debAIDe API",
     description="AI-powered debate practice platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -66,23 +82,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-gemini_service = GeminiService()
+# Initialize services; the Gemini client is shared and built lazily on
+# first use so startup doesn't pay for SDK configuration
 storage_service = StorageService()
 stt_service = STTService()
 
 # Security
 security = HTTPBearer(auto_error=False)
 
+# Hot-path statements built once at import time so the compiled form is
+# reused from the engine's query cache across requests
+USER_BY_ID_STMT = (
+    select(User)
+    .options(selectinload(User.stats), raiseload("*"))
+    .where(User.id == bindparam("uid"))
+)
+
+# Strips optional ```json fences that LLMs wrap around JSON output
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+# Per-resource locks so concurrent score/judge calls for the same session
+# or battle serialize around the Gemini call instead of both paying for it.
+# In-process only, which matches the single-worker deployment. Entries are
+# refcounted and dropped once the last waiter releases, so the maps stay
+# bounded by current contention instead of growing with every key seen.
+_SCORE_LOCKS: dict = {}
+_JUDGE_LOCKS: dict = {}
+
+
+@asynccontextmanager
+async def _keyed_lock(locks: dict, key):
+    """Hold the per-key lock, evicting the entry when nobody else waits"""
+    entry = locks.get(key)
+    if entry is None:
+        entry = locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            locks.pop(key, None)
+
+# Word counter for duration estimates; finditer counts matches without
+# materializing a list of every word the way str.split() does
+_WORD_RE = re.compile(r"\S+")
+
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user from JWT token"""
     if not credentials:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    
+
+    # Memoize per request so nested dependencies don't re-run the SELECT
+    cached_user = getattr(request.state, "current_user", None)
+    if cached_user is not None:
+        return cached_user
+
     token = credentials.credentials
     payload = decode_access_token(token)
     
@@ -93,13 +154,13 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
     
-    from sqlalchemy import select
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(USER_BY_ID_STMT, {"uid": user_id})
     user = result.scalars().first()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
+
+    request.state.current_user = user
     return user
 
 
@@ -125,46 +186,44 @@ async def register(
     db: AsyncSession = Depends(get_db)
 ):
     """Register a new user"""
-    from sqlalchemy import select
-    
-    # Check if username exists
-    result = await db.execute(select(User).where(User.username == username))
-    if result.scalars().first():
-        raise HTTPException(status_code=400, detail="Username already taken")
-    
-    # Check if email exists
-    result = await db.execute(select(User).where(User.email == email))
-    if result.scalars().first():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create new user
-    user = User(
-        id=str(uuid.uuid4()),
-        username=username,
-        email=email,
-        hashed_password=get_password_hash(password)
+
+    # Insert directly and let the unique constraints reject duplicates,
+    # instead of racing separate existence checks against the insert
+    user_id = str(uuid.uuid4())
+    stmt = (
+        pg_insert(User)
+        .values(
+            id=user_id,
+            username=username,
+            email=email,
+            hashed_password=await get_password_hash(password)
+        )
+        .on_conflict_do_nothing()
+        .returning(User.id)
     )
-    
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    
-    # Create initial stats for user
-    from models import UserStats
-    stats = UserStats(user_id=user.id)
-    db.add(stats)
+    result = await db.execute(stmt)
+
+    if result.scalar() is None:
+        # Conflict: one cheap lookup to tell the caller which field collided
+        result = await db.execute(select(User.id).where(User.username == username))
+        if result.first():
+            raise HTTPException(status_code=400, detail="Username already taken")
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # Create initial stats in the same transaction: one commit, one WAL flush
+    db.add(UserStats(user_id=user_id))
     await db.commit()
-    
+
     # Generate token
-    access_token = create_access_token(data={"sub": user.id})
-    
+    access_token = create_access_token(data={"sub": user_id})
+
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "user": {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email
+            "id": user_id,
+            "username": username,
+            "email": email
         }
     }
 
@@ -172,29 +231,33 @@ async def register(
 @app.post("/auth/login")
 async def login(
     username: str,
-    password: str,
-    db: AsyncSession = Depends(get_db)
+    password: str
 ):
     """Login user"""
-    from sqlalchemy import select
-    
-    # Find user by username
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
-    
-    if not user or not verify_password(password, user.hashed_password):
+
+    # Hot path: fetch only the columns the response needs over the raw
+    # asyncpg connection (its prepared-statement cache kicks in), skipping
+    # ORM entity construction entirely
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        row = await raw.driver_connection.fetchrow(
+            "SELECT id, hashed_password, email FROM users WHERE username = $1",
+            username
+        )
+
+    if not row or not await verify_password(password, row["hashed_password"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
-    
+
     # Generate token
-    access_token = create_access_token(data={"sub": user.id})
-    
+    access_token = create_access_token(data={"sub": row["id"]})
+
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "user": {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email
+            "id": row["id"],
+            "username": username,
+            "email": row["email"]
         }
     }
 
@@ -221,94 +284,134 @@ async def get_user_stats(
     db: AsyncSession = Depends(get_db)
 ):
     """Get user statistics"""
-    from sqlalchemy import select
-    from models import UserStats
-    
-    # Get or create user stats
-    result = await db.execute(select(UserStats).where(UserStats.user_id == current_user.id))
-    stats = result.scalars().first()
-    
-    if not stats:
+
+    # Postgres round(float, digits) needs a numeric cast
+    def rnd(col, digits):
+        return func.round(cast(col, Numeric), digits)
+
+    # One projected SELECT with rounding and win rate computed server-side
+    stmt = select(
+        UserStats.user_id,
+        UserStats.total_practice_sessions,
+        UserStats.completed_practice_sessions,
+        rnd(UserStats.average_practice_score, 2).label("average_practice_score"),
+        UserStats.total_battles,
+        UserStats.battles_won,
+        UserStats.battles_lost,
+        rnd(
+            case(
+                (UserStats.total_battles > 0, UserStats.battles_won * 100.0 / UserStats.total_battles),
+                else_=0
+            ),
+            1
+        ).label("win_rate"),
+        UserStats.current_win_streak,
+        UserStats.best_win_streak,
+        rnd(UserStats.avg_structure_score, 2).label("structure"),
+        rnd(UserStats.avg_logic_score, 2).label("logic"),
+        rnd(UserStats.avg_delivery_score, 2).label("delivery"),
+        rnd(UserStats.avg_time_use_score, 2).label("time_use"),
+        rnd(UserStats.total_debate_time / 60, 1).label("total_debate_time"),  # Convert to minutes
+        UserStats.last_activity,
+        UserStats.favorite_stance
+    ).where(UserStats.user_id == current_user.id)
+
+    row = (await db.execute(stmt)).mappings().first()
+
+    if row is None:
         # Create initial stats for user
-        stats = UserStats(user_id=current_user.id)
-        db.add(stats)
+        db.add(UserStats(user_id=current_user.id))
         await db.commit()
-        await db.refresh(stats)
-    
+        row = (await db.execute(stmt)).mappings().first()
+
     return {
-        "user_id": stats.user_id,
+        "user_id": row["user_id"],
         "username": current_user.username,
-        "total_practice_sessions": stats.total_practice_sessions,
-        "completed_practice_sessions": stats.completed_practice_sessions,
-        "average_practice_score": round(stats.average_practice_score, 2),
-        "total_battles": stats.total_battles,
-        "battles_won": stats.battles_won,
-        "battles_lost": stats.battles_lost,
-        "win_rate": round((stats.battles_won / stats.total_battles * 100) if stats.total_battles > 0 else 0, 1),
-        "current_win_streak": stats.current_win_streak,
-        "best_win_streak": stats.best_win_streak,
+        "total_practice_sessions": row["total_practice_sessions"],
+        "completed_practice_sessions": row["completed_practice_sessions"],
+        "average_practice_score": row["average_practice_score"],
+        "total_battles": row["total_battles"],
+        "battles_won": row["battles_won"],
+        "battles_lost": row["battles_lost"],
+        "win_rate": row["win_rate"],
+        "current_win_streak": row["current_win_streak"],
+        "best_win_streak": row["best_win_streak"],
         "skill_scores": {
-            "structure": round(stats.avg_structure_score, 2),
-            "logic": round(stats.avg_logic_score, 2),
-            "delivery": round(stats.avg_delivery_score, 2),
-            "time_use": round(stats.avg_time_use_score, 2)
+            "structure": row["structure"],
+            "logic": row["logic"],
+            "delivery": row["delivery"],
+            "time_use": row["time_use"]
         },
-        "total_debate_time": round(stats.total_debate_time / 60, 1),  # Convert to minutes
-        "last_activity": stats.last_activity,
-        "favorite_stance": stats.favorite_stance,
+        "total_debate_time": row["total_debate_time"],
+        "last_activity": row["last_activity"],
+        "favorite_stance": row["favorite_stance"],
         "member_since": current_user.created_at
     }
 
 
 async def update_user_stats_for_practice(user_id: str, scorecard: Scorecard, db: AsyncSession):
     """Update user stats after completing a practice session"""
-    from sqlalchemy import select
-    from models import UserStats
-    from sqlalchemy.sql import func
-    
-    result = await db.execute(select(UserStats).where(UserStats.user_id == user_id))
-    stats = result.scalars().first()
-    
-    if not stats:
-        stats = UserStats(user_id=user_id)
-        db.add(stats)
-    
-    # Update practice session counts
-    stats.total_practice_sessions += 1
-    stats.completed_practice_sessions += 1
-    
-    # Update average scores
-    total_completed = stats.completed_practice_sessions
-    stats.avg_structure_score = ((stats.avg_structure_score * (total_completed - 1)) + scorecard.structure_score) / total_completed
-    stats.avg_logic_score = ((stats.avg_logic_score * (total_completed - 1)) + scorecard.logic_score) / total_completed
-    stats.avg_delivery_score = ((stats.avg_delivery_score * (total_completed - 1)) + scorecard.delivery_score) / total_completed
-    stats.avg_time_use_score = ((stats.avg_time_use_score * (total_completed - 1)) + scorecard.time_use_score) / total_completed
-    stats.average_practice_score = ((stats.average_practice_score * (total_completed - 1)) + scorecard.total_score) / total_completed
-    
-    # Update activity
-    stats.last_activity = func.now()
-    
+
+    # Single server-side upsert: the running averages are recomputed in SQL
+    # from the existing row, so there is no SELECT + Python arithmetic cycle
+    completed = UserStats.completed_practice_sessions
+    stmt = (
+        pg_insert(UserStats)
+        .values(
+            user_id=user_id,
+            total_practice_sessions=1,
+            completed_practice_sessions=1,
+            avg_structure_score=scorecard.structure_score,
+            avg_logic_score=scorecard.logic_score,
+            avg_delivery_score=scorecard.delivery_score,
+            avg_time_use_score=scorecard.time_use_score,
+            average_practice_score=scorecard.total_score,
+            sum_structure_score=scorecard.structure_score,
+            sum_logic_score=scorecard.logic_score,
+            sum_delivery_score=scorecard.delivery_score,
+            sum_time_use_score=scorecard.time_use_score,
+            sum_total_score=scorecard.total_score,
+            last_activity=func.now()
+        )
+        .on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "total_practice_sessions": UserStats.total_practice_sessions + 1,
+                "completed_practice_sessions": completed + 1,
+                "sum_structure_score": UserStats.sum_structure_score + scorecard.structure_score,
+                "sum_logic_score": UserStats.sum_logic_score + scorecard.logic_score,
+                "sum_delivery_score": UserStats.sum_delivery_score + scorecard.delivery_score,
+                "sum_time_use_score": UserStats.sum_time_use_score + scorecard.time_use_score,
+                "sum_total_score": UserStats.sum_total_score + scorecard.total_score,
+                # Averages derived from the sums, so they stay exact for any n
+                "avg_structure_score": (UserStats.sum_structure_score + scorecard.structure_score) / (completed + 1),
+                "avg_logic_score": (UserStats.sum_logic_score + scorecard.logic_score) / (completed + 1),
+                "avg_delivery_score": (UserStats.sum_delivery_score + scorecard.delivery_score) / (completed + 1),
+                "avg_time_use_score": (UserStats.sum_time_use_score + scorecard.time_use_score) / (completed + 1),
+                "average_practice_score": (UserStats.sum_total_score + scorecard.total_score) / (completed + 1),
+                "last_activity": func.now()
+            }
+        )
+    )
+    await db.execute(stmt)
     await db.commit()
 
 
 async def update_user_stats_for_battle(battle: Battle, db: AsyncSession):
     """Update user stats after completing a battle"""
-    from sqlalchemy import select
-    from models import UserStats
-    from sqlalchemy.sql import func
-    
-    # Update stats for both players
-    for player_id in [battle.player1_id, battle.player2_id]:
-        if not player_id:
-            continue
-            
-        result = await db.execute(select(UserStats).where(UserStats.user_id == player_id))
-        stats = result.scalars().first()
-        
+    
+    # Fetch stats for both players in a single query
+    player_ids = [pid for pid in (battle.player1_id, battle.player2_id) if pid]
+    result = await db.execute(select(UserStats).where(UserStats.user_id.in_(player_ids)))
+    stats_by_user = {stats.user_id: stats for stats in result.scalars().all()}
+
+    for player_id in player_ids:
+        stats = stats_by_user.get(player_id)
+
         if not stats:
             stats = UserStats(user_id=player_id)
             db.add(stats)
-        
+
         # Update battle counts
         stats.total_battles += 1
         
@@ -331,50 +434,85 @@ async def update_user_stats_for_battle(battle: Battle, db: AsyncSession):
 # ============================================================================
 
 
+# In-process TTL cache for the topic endpoints; topics change rarely
+# (seed + one AI generation per day) so short TTLs are safe
+_TOPIC_CACHE = {}
+TOPICS_ALL_TTL = 300  # seconds
+TOPICS_DAILY_TTL = 24 * 3600
+
+
+def _topic_cache_get(key):
+    entry = _TOPIC_CACHE.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _topic_cache_put(key, value, ttl):
+    _TOPIC_CACHE[key] = (time.monotonic() + ttl, value)
+
+
 @app.get("/topics", response_model=list[TopicResponse])
-async def get_topics(db: AsyncSession = Depends(get_db)):
+async def get_topics(request: Request, db: AsyncSession = Depends(get_db)):
     """Get all debate topics"""
-    from sqlalchemy import select
-    
-    result = await db.execute(select(Topic))
-    topics = result.scalars().all()
-    
-    return [
-        TopicResponse(
-            id=topic.id,
-            title=topic.title,
-            description=topic.description,
-            difficulty=topic.difficulty,
-            category=topic.category
-        )
-        for topic in topics
-    ]
+
+    # The cache holds the fully encoded body plus its ETag, so a hit does
+    # no serialization at all and a matching If-None-Match sends no body
+    cached = _topic_cache_get("topics:all")
+    if cached is None:
+        result = await db.execute(select(Topic))
+        topics = result.scalars().all()
+
+        body = orjson.dumps([
+            {
+                "id": topic.id,
+                "title": topic.title,
+                "description": topic.description,
+                "difficulty": topic.difficulty,
+                "category": topic.category
+            }
+            for topic in topics
+        ])
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        cached = (etag, body)
+        _topic_cache_put("topics:all", cached, TOPICS_ALL_TTL)
+
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={TOPICS_ALL_TTL}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/topics/daily", response_model=TopicResponse)
 async def get_daily_topic(db: AsyncSession = Depends(get_db)):
     """Get AI-generated topic of the day"""
-    from sqlalchemy import select, func
-    from datetime import date
     
     # Check if we have a topic for today
     today = date.today()
+
+    cached = _topic_cache_get(f"topics:daily:{today.isoformat()}")
+    if cached is not None:
+        return cached
+
     result = await db.execute(
         select(Topic).where(Topic.created_at >= today).order_by(Topic.created_at.desc())
     )
     topic = result.scalars().first()
     
     if topic:
-        return TopicResponse(
+        response = TopicResponse.model_construct(
             id=topic.id,
             title=topic.title,
             description=topic.description,
             difficulty=topic.difficulty,
             category=topic.category
         )
+        _topic_cache_put(f"topics:daily:{today.isoformat()}", response, TOPICS_DAILY_TTL)
+        return response
     
     # Generate new topic using Gemini
-    generated_topic = await gemini_service.generate_daily_topic()
+    generated_topic = await get_gemini_service().generate_daily_topic()
     
     # Save to database
     new_topic = Topic(
@@ -387,13 +525,17 @@ async def get_daily_topic(db: AsyncSession = Depends(get_db)):
     await db.commit()
     await db.refresh(new_topic)
     
-    return TopicResponse(
+    response = TopicResponse.model_construct(
         id=new_topic.id,
         title=new_topic.title,
         description=new_topic.description,
         difficulty=new_topic.difficulty,
         category=new_topic.category
     )
+    # New topic invalidates the full listing; cache today's pick
+    _TOPIC_CACHE.pop("topics:all", None)
+    _topic_cache_put(f"topics:daily:{today.isoformat()}", response, TOPICS_DAILY_TTL)
+    return response
 
 
 @app.post("/session/start", response_model=SessionStartResponse)
@@ -402,13 +544,14 @@ async def start_session(
     db: AsyncSession = Depends(get_db)
 ):
     """Start a new debate session"""
-    from sqlalchemy import select
-    
-    # Verify topic exists
-    result = await db.execute(select(Topic).where(Topic.id == request.topic_id))
-    topic = result.scalars().first()
     
-    if not topic:
+    # Verify the topic exists and grab the two columns the response needs;
+    # the insert rides in the same transaction so there is a single commit
+    topic_row = (await db.execute(
+        select(Topic.title, Topic.description).where(Topic.id == request.topic_id)
+    )).first()
+
+    if not topic_row:
         raise HTTPException(status_code=404, detail="Topic not found")
     
     # Randomly assign stance
@@ -426,29 +569,53 @@ async def start_session(
     db.add(session)
     await db.commit()
     
-    return SessionStartResponse(
+    return SessionStartResponse.model_construct(
         session_id=session_id,
-        topic_title=topic.title,
+        topic_title=topic_row.title,
         stance=stance,
-        topic_description=topic.description
+        topic_description=topic_row.description
     )
 
 
+async def _transcribe_segment(segment_id: int, temp_path: str):
+    """Background task: transcribe an uploaded segment and store the result"""
+    try:
+        result = await stt_service.transcribe(temp_path)
+        values = {
+            "transcript": result["text"],
+            "duration": result.get("duration", 0),
+            "status": "done"
+        }
+    except Exception as e:
+        print(f"Background transcription failed for segment {segment_id}: {e}")
+        values = {"status": "failed"}
+    finally:
+        try:
+            await asyncio.to_thread(os.remove, temp_path)
+        except OSError:
+            pass
+
+    # Runs after the request session is gone, so it opens its own
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Segment).where(Segment.id == segment_id).values(**values)
+        )
+        await db.commit()
+
+
 @app.post("/segment/upload", response_model=SegmentUploadResponse)
 async def upload_segment(
     session_id: str,
     kind: str,  # 'opening', 'rebuttal', 'closing'
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db)
 ):
-    """Upload and process an audio segment"""
-    from sqlalchemy import select
+    """Upload an audio segment; transcription completes in the background"""
     
-    # Verify session exists
-    result = await db.execute(
-        select(DebateSession).where(DebateSession.id == session_id)
-    )
-    session = result.scalars().first()
+    # Verify session exists; db.get can serve repeat PK lookups from the
+    # identity map without a SQL round-trip
+    session = await db.get(DebateSession, session_id)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -458,36 +625,70 @@ async def upload_segment(
         raise HTTPException(status_code=400, detail="Invalid segment kind")
     
     try:
-        # Upload audio to storage
-        audio_url = await storage_service.upload_audio(file, session_id, kind)
-        
-        # Transcribe audio
-        transcript = await stt_service.transcribe(audio_url)
+        # Spool the upload to a temp file once; the storage copy happens
+        # now, the (seconds-long) Whisper pass after the response is sent
+        async with aiofiles.tempfile.NamedTemporaryFile(
+            'wb', suffix='.webm', delete=False
+        ) as temp_file:
+            while chunk := await file.read(1 << 20):
+                await temp_file.write(chunk)
+            temp_path = temp_file.name
+
+        audio_url = await storage_service.upload_audio_path(
+            temp_path,
+            session_id,
+            kind,
+            content_type=file.content_type,
+            original_filename=file.filename
+        )
         
-        # Save segment
+        # Save segment as pending; clients poll GET /segment/{id} for the
+        # transcript instead of holding this connection open through STT
         segment = Segment(
             session_id=session_id,
             kind=kind,
             audio_url=audio_url,
-            transcript=transcript["text"],
-            duration=transcript.get("duration", 0)
+            transcript=None,
+            duration=0.0,
+            status="pending"
         )
         
         db.add(segment)
         await db.commit()
         await db.refresh(segment)
+
+        background_tasks.add_task(_transcribe_segment, segment.id, temp_path)
         
-        return SegmentUploadResponse(
+        return SegmentUploadResponse.model_construct(
             segment_id=segment.id,
-            transcript=segment.transcript,
+            transcript=None,
             audio_url=audio_url,
-            duration=segment.duration
+            duration=0.0,
+            status="pending"
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+@app.get("/segment/{segment_id}", response_model=SegmentUploadResponse)
+async def get_segment(segment_id: int, db: AsyncSession = Depends(get_db)):
+    """Poll an uploaded segment for its transcription status"""
+    
+    segment = await db.get(Segment, segment_id)
+    
+    if not segment:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    
+    return SegmentUploadResponse.model_construct(
+        segment_id=segment.id,
+        transcript=segment.transcript,
+        audio_url=segment.audio_url,
+        duration=segment.duration,
+        status=segment.status
+    )
+
+
 @app.post("/segment/text", response_model=SegmentUploadResponse)
 async def submit_text_segment(
     session_id: str,
@@ -496,13 +697,10 @@ async def submit_text_segment(
     db: AsyncSession = Depends(get_db)
 ):
     """Submit a text-based debate segment (without audio recording)"""
-    from sqlalchemy import select
     
-    # Verify session exists
-    result = await db.execute(
-        select(DebateSession).where(DebateSession.id == session_id)
-    )
-    session = result.scalars().first()
+    # Verify session exists; db.get can serve repeat PK lookups from the
+    # identity map without a SQL round-trip
+    session = await db.get(DebateSession, session_id)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -516,7 +714,7 @@ async def submit_text_segment(
             raise HTTPException(status_code=400, detail="Text cannot be empty")
         
         # Calculate approximate duration (150 words per minute speaking rate)
-        word_count = len(text.split())
+        word_count = sum(1 for _ in _WORD_RE.finditer(text))
         duration = (word_count / 150) * 60
         
         # Save segment (no audio URL for text submissions)
@@ -532,11 +730,12 @@ async def submit_text_segment(
         await db.commit()
         await db.refresh(segment)
         
-        return SegmentUploadResponse(
+        return SegmentUploadResponse.model_construct(
             segment_id=segment.id,
             transcript=segment.transcript,
             audio_url=None,
-            duration=segment.duration
+            duration=segment.duration,
+            status="done"
         )
         
     except Exception as e:
@@ -546,99 +745,109 @@ async def submit_text_segment(
 @app.post("/session/score", response_model=ScoreResponse)
 async def score_session(session_id: str, db: AsyncSession = Depends(get_db)):
     """Score a completed debate session"""
-    from sqlalchemy import select
     
-    # Get session with all segments
-    result = await db.execute(
-        select(DebateSession).where(DebateSession.id == session_id)
+    # Session, segments, topic, and any existing scorecard in one round-trip
+    session = await db.get(
+        DebateSession,
+        session_id,
+        options=[
+            selectinload(DebateSession.segments),
+            joinedload(DebateSession.topic),
+            joinedload(DebateSession.scorecard)
+            .undefer(Scorecard.feedback)
+            .undefer(Scorecard.highlights)
+            .undefer(Scorecard.drills)
+        ]
     )
-    session = result.scalars().first()
-    
+
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Get all segments
-    result = await db.execute(
-        select(Segment).where(Segment.session_id == session_id)
-    )
-    segments = result.scalars().all()
-    
+
+    segments = session.segments
+
     if not segments:
         raise HTTPException(status_code=400, detail="No segments found for session")
+
+    if any(seg.status == "pending" for seg in segments):
+        raise HTTPException(status_code=400, detail="Transcription still in progress")
+
+    topic = session.topic
     
-    # Get topic
-    result = await db.execute(select(Topic).where(Topic.id == session.topic_id))
-    topic = result.scalars().first()
-    
-    # Prepare data for Gemini
+    # Prepare data for Gemini as parallel field lists; the prompt builder
+    # zips them instead of doing per-dict lookups on every segment
     session_data = {
         "topic": topic.title,
         "stance": session.stance,
-        "segments": [
-            {
-                "kind": seg.kind,
-                "transcript": seg.transcript,
-                "duration": seg.duration
-            }
-            for seg in segments
-        ]
+        "segment_kinds": [seg.kind for seg in segments],
+        "segment_durations": [seg.duration for seg in segments],
+        "segment_transcripts": [seg.transcript for seg in segments]
     }
     
     try:
-        # Check if scorecard already exists
-        result = await db.execute(
-            select(Scorecard).where(Scorecard.session_id == session_id)
-        )
-        existing_scorecard = result.scalars().first()
+        async with _keyed_lock(_SCORE_LOCKS, session_id):
+            # Scorecard was eager-loaded with the session; short-circuit if present
+            existing_scorecard = session.scorecard
+
+            if existing_scorecard is None:
+                # Re-check under the lock: a concurrent call may have written the
+                # scorecard while this one was waiting
+                existing_scorecard = (await db.execute(
+                    select(Scorecard)
+                    .options(
+                        undefer(Scorecard.feedback),
+                        undefer(Scorecard.highlights),
+                        undefer(Scorecard.drills)
+                    )
+                    .where(Scorecard.session_id == session_id)
+                )).scalars().first()
         
-        if existing_scorecard:
-            # Return existing scorecard
-            return ScoreResponse(
-                session_id=session_id,
-                scores=ScoreBreakdown(
-                    structure=existing_scorecard.structure_score,
-                    logic=existing_scorecard.logic_score,
-                    delivery=existing_scorecard.delivery_score,
-                    time_use=existing_scorecard.time_use_score,
-                    total=existing_scorecard.total_score
-                ),
-                feedback=existing_scorecard.feedback,
-                highlights=existing_scorecard.highlights,
-                drills=existing_scorecard.drills
-            )
+            if existing_scorecard:
+                # Return existing scorecard
+                return ScoreResponse(
+                    session_id=session_id,
+                    scores=ScoreBreakdown(
+                        structure=existing_scorecard.structure_score,
+                        logic=existing_scorecard.logic_score,
+                        delivery=existing_scorecard.delivery_score,
+                        time_use=existing_scorecard.time_use_score,
+                        total=existing_scorecard.total_score
+                    ),
+                    feedback=existing_scorecard.feedback,
+                    highlights=existing_scorecard.highlights,
+                    drills=existing_scorecard.drills
+                )
         
-        # Get AI scoring
-        scoring_result = await gemini_service.score_debate(session_data)
+            # Get AI scoring
+            scoring_result = await get_gemini_service().score_debate(session_data)
         
-        # Save scorecard
-        scorecard = Scorecard(
-            session_id=session_id,
-            structure_score=scoring_result["scores"]["structure"],
-            logic_score=scoring_result["scores"]["logic"],
-            delivery_score=scoring_result["scores"]["delivery"],
-            time_use_score=scoring_result["scores"]["time_use"],
-            total_score=scoring_result["scores"]["total"],
-            feedback=scoring_result["feedback"],
-            highlights=scoring_result.get("highlights", []),
-            drills=scoring_result.get("drills", [])
-        )
+            # Save scorecard
+            scorecard = Scorecard(
+                session_id=session_id,
+                structure_score=scoring_result["scores"]["structure"],
+                logic_score=scoring_result["scores"]["logic"],
+                delivery_score=scoring_result["scores"]["delivery"],
+                time_use_score=scoring_result["scores"]["time_use"],
+                feedback=scoring_result["feedback"],
+                highlights=scoring_result.get("highlights", []),
+                drills=scoring_result.get("drills", [])
+            )
         
-        db.add(scorecard)
-        session.status = "completed"
-        await db.commit()
-        await db.refresh(scorecard)
+            db.add(scorecard)
+            session.status = "completed"
+            await db.commit()
+            await db.refresh(scorecard)
         
-        # Update user stats after completing practice session
-        if session.user_id:
-            await update_user_stats_for_practice(session.user_id, scorecard, db)
+            # Update user stats after completing practice session
+            if session.user_id:
+                await update_user_stats_for_practice(session.user_id, scorecard, db)
         
-        return ScoreResponse(
-            session_id=session_id,
-            scores=ScoreBreakdown(**scoring_result["scores"]),
-            feedback=scoring_result["feedback"],
-            highlights=scoring_result.get("highlights", []),
-            drills=scoring_result.get("drills", [])
-        )
+            return ScoreResponse(
+                session_id=session_id,
+                scores=ScoreBreakdown(**scoring_result["scores"]),
+                feedback=scoring_result["feedback"],
+                highlights=scoring_result.get("highlights", []),
+                drills=scoring_result.get("drills", [])
+            )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
@@ -647,27 +856,26 @@ async def score_session(session_id: str, db: AsyncSession = Depends(get_db)):
 @app.get("/session/{session_id}/history")
 async def get_session_history(session_id: str, db: AsyncSession = Depends(get_db)):
     """Get complete session history with segments and scores"""
-    from sqlalchemy import select
     
-    result = await db.execute(
-        select(DebateSession).where(DebateSession.id == session_id)
+    # One round-trip: segments and scorecard (with its deferred feedback
+    # payloads, which this view shows) come back with the session
+    session = await db.get(
+        DebateSession,
+        session_id,
+        options=[
+            selectinload(DebateSession.segments),
+            joinedload(DebateSession.scorecard)
+            .undefer(Scorecard.feedback)
+            .undefer(Scorecard.highlights)
+            .undefer(Scorecard.drills)
+        ]
     )
-    session = result.scalars().first()
-    
+
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Get segments
-    result = await db.execute(
-        select(Segment).where(Segment.session_id == session_id)
-    )
-    segments = result.scalars().all()
-    
-    # Get scorecard
-    result = await db.execute(
-        select(Scorecard).where(Scorecard.session_id == session_id)
-    )
-    scorecard = result.scalars().first()
+
+    segments = session.segments
+    scorecard = session.scorecard
     
     return {
         "session": {
@@ -714,11 +922,9 @@ async def create_battle(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new battle room"""
-    from sqlalchemy import select, delete
     
     # Verify topic exists
-    result = await db.execute(select(Topic).where(Topic.id == topic_id))
-    topic = result.scalars().first()
+    topic = await db.get(Topic, topic_id)
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
@@ -726,32 +932,39 @@ async def create_battle(
     if stance not in ['pro', 'con']:
         raise HTTPException(status_code=400, detail="Stance must be 'pro' or 'con'")
     
-    # Delete any existing battles created by this user that are still in "waiting" status
-    await db.execute(
-        delete(Battle).where(
-            Battle.player1_id == current_user.id,
-            Battle.status == "waiting"
+    # One upsert replaces the old DELETE + commit + INSERT + commit cycle:
+    # the partial unique index on (player1_id) WHERE status='waiting'
+    # guarantees a user has at most one open room, and a conflict simply
+    # repoints that room at the new topic and stance
+    stmt = (
+        pg_insert(Battle)
+        .values(
+            id=str(uuid.uuid4()),
+            topic_id=topic_id,
+            player1_id=current_user.id,
+            player1_stance=stance,
+            status="waiting",
+            current_segment="opening",
+            current_turn=current_user.id  # Player 1 starts
         )
+        .on_conflict_do_update(
+            index_elements=[Battle.player1_id],
+            index_where=Battle.status == "waiting",
+            set_={
+                "topic_id": topic_id,
+                "player1_stance": stance,
+                "current_segment": "opening",
+                "current_turn": current_user.id,
+                "created_at": func.now()
+            }
+        )
+        .returning(Battle.id)
     )
+    battle_id = (await db.execute(stmt)).scalar()
     await db.commit()
     
-    # Create battle
-    battle = Battle(
-        id=str(uuid.uuid4()),
-        topic_id=topic_id,
-        player1_id=current_user.id,
-        player1_stance=stance,
-        status="waiting",
-        current_segment="opening",
-        current_turn=current_user.id  # Player 1 starts
-    )
-    
-    db.add(battle)
-    await db.commit()
-    await db.refresh(battle)
-    
     return {
-        "battle_id": battle.id,
+        "battle_id": battle_id,
         "topic": {
             "id": topic.id,
             "title": topic.title,
@@ -773,11 +986,9 @@ async def join_battle(
     db: AsyncSession = Depends(get_db)
 ):
     """Join an existing battle as player 2"""
-    from sqlalchemy import select
     
     # Get battle
-    result = await db.execute(select(Battle).where(Battle.id == battle_id))
-    battle = result.scalars().first()
+    battle = await db.get(Battle, battle_id)
     
     if not battle:
         raise HTTPException(status_code=404, detail="Battle not found")
@@ -801,12 +1012,10 @@ async def join_battle(
     await db.refresh(battle)
     
     # Get player1 info
-    result = await db.execute(select(User).where(User.id == battle.player1_id))
-    player1 = result.scalars().first()
+    player1 = await db.get(User, battle.player1_id)
     
     # Get topic info
-    result = await db.execute(select(Topic).where(Topic.id == battle.topic_id))
-    topic = result.scalars().first()
+    topic = await db.get(Topic, battle.topic_id)
     
     return {
         "battle_id": battle.id,
@@ -835,40 +1044,41 @@ async def get_available_battles(
     current_user: User = Depends(get_current_user)
 ):
     """Get list of available battles to join"""
-    from sqlalchemy import select
-    
-    result = await db.execute(
-        select(Battle)
+
+    # List endpoint: project exactly the columns the response emits through
+    # explicit joins, skipping ORM entity hydration for every row
+    rows = (await db.execute(
+        select(
+            Battle.id,
+            Battle.player1_stance,
+            Battle.created_at,
+            Topic.id.label("topic_id"),
+            Topic.title,
+            Topic.difficulty,
+            User.username
+        )
+        .join(Topic, Battle.topic_id == Topic.id)
+        .join(User, Battle.player1_id == User.id)
         .where(Battle.status == "waiting")
         .where(Battle.player1_id != current_user.id)
-    )
-    battles = result.scalars().all()
-    
-    battle_list = []
-    for battle in battles:
-        # Get topic
-        topic_result = await db.execute(select(Topic).where(Topic.id == battle.topic_id))
-        topic = topic_result.scalars().first()
-        
-        # Get player1
-        player_result = await db.execute(select(User).where(User.id == battle.player1_id))
-        player1 = player_result.scalars().first()
-        
-        battle_list.append({
-            "battle_id": battle.id,
+    )).all()
+
+    return [
+        {
+            "battle_id": row.id,
             "topic": {
-                "id": topic.id,
-                "title": topic.title,
-                "difficulty": topic.difficulty
+                "id": row.topic_id,
+                "title": row.title,
+                "difficulty": row.difficulty
             },
             "player1": {
-                "username": player1.username,
-                "stance": battle.player1_stance
+                "username": row.username,
+                "stance": row.player1_stance
             },
-            "created_at": battle.created_at
-        })
-    
-    return battle_list
+            "created_at": row.created_at
+        }
+        for row in rows
+    ]
 
 
 @app.get("/battle/{battle_id}/status")
@@ -878,44 +1088,44 @@ async def get_battle_status(
     db: AsyncSession = Depends(get_db)
 ):
     """Get current battle status including turn and segment info"""
-    from sqlalchemy import select
-    
-    # Get battle
-    result = await db.execute(select(Battle).where(Battle.id == battle_id))
-    battle = result.scalars().first()
-    
+
+    # Clients poll this endpoint: battle, players, and topic come back in
+    # one statement instead of five sequential queries
+    battle = await db.get(
+        Battle,
+        battle_id,
+        options=[
+            joinedload(Battle.player1),
+            joinedload(Battle.player2),
+            joinedload(Battle.topic)
+        ]
+    )
+
     if not battle:
         raise HTTPException(status_code=404, detail="Battle not found")
-    
+
     # Verify user is a participant
     if current_user.id not in [battle.player1_id, battle.player2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this battle")
-    
-    # Get all segments
-    result = await db.execute(
-        select(BattleSegment).where(BattleSegment.battle_id == battle_id)
-    )
-    segments = result.scalars().all()
-    
-    # Get player info
-    player1_result = await db.execute(select(User).where(User.id == battle.player1_id))
-    player1 = player1_result.scalars().first()
-    
-    player2_result = await db.execute(select(User).where(User.id == battle.player2_id))
-    player2 = player2_result.scalars().first() if battle.player2_id else None
-    
-    # Get topic
-    topic_result = await db.execute(select(Topic).where(Topic.id == battle.topic_id))
-    topic = topic_result.scalars().first()
-    
-    # Count segments by player and type
+
+    player1 = battle.player1
+    player2 = battle.player2
+    topic = battle.topic
+
+    # The flags only need (player_id, kind) pairs; selecting just those two
+    # columns keeps transcript payloads out of the poll loop entirely
+    rows = (await db.execute(
+        select(BattleSegment.player_id, BattleSegment.kind)
+        .where(BattleSegment.battle_id == battle_id)
+    )).all()
+
     player1_segments = {}
     player2_segments = {}
-    for seg in segments:
-        if seg.player_id == battle.player1_id:
-            player1_segments[seg.kind] = True
-        elif seg.player_id == battle.player2_id:
-            player2_segments[seg.kind] = True
+    for player_id, seg_kind in rows:
+        if player_id == battle.player1_id:
+            player1_segments[seg_kind] = True
+        elif player_id == battle.player2_id:
+            player2_segments[seg_kind] = True
     
     return {
         "battle_id": battle.id,
@@ -952,11 +1162,9 @@ async def get_battle_segments(
     db: AsyncSession = Depends(get_db)
 ):
     """Get all segments for a battle"""
-    from sqlalchemy import select
     
     # Get battle
-    result = await db.execute(select(Battle).where(Battle.id == battle_id))
-    battle = result.scalars().first()
+    battle = await db.get(Battle, battle_id)
     
     if not battle:
         raise HTTPException(status_code=404, detail="Battle not found")
@@ -991,11 +1199,9 @@ async def submit_battle_segment(
     db: AsyncSession = Depends(get_db)
 ):
     """Submit a segment in a battle"""
-    from sqlalchemy import select
     
     # Get battle
-    result = await db.execute(select(Battle).where(Battle.id == battle_id))
-    battle = result.scalars().first()
+    battle = await db.get(Battle, battle_id)
     
     if not battle:
         raise HTTPException(status_code=404, detail="Battle not found")
@@ -1020,9 +1226,18 @@ async def submit_battle_segment(
         raise HTTPException(status_code=400, detail="Invalid segment kind")
     
     # Calculate duration
-    word_count = len(text.split())
+    word_count = sum(1 for _ in _WORD_RE.finditer(text))
     duration = (word_count / 150) * 60
     
+    # Count existing segments of this kind before inserting: a scalar
+    # COUNT(*) ships one integer instead of full transcript rows
+    prev_count = (await db.execute(
+        select(func.count()).where(
+            BattleSegment.battle_id == battle_id,
+            BattleSegment.kind == kind
+        )
+    )).scalar()
+
     # Create segment
     segment = BattleSegment(
         battle_id=battle_id,
@@ -1038,17 +1253,8 @@ async def submit_battle_segment(
     # Switch turn to other player
     battle.current_turn = battle.player2_id if current_user.id == battle.player1_id else battle.player1_id
     
-    # Check if both players have submitted this segment type
-    result = await db.execute(
-        select(BattleSegment).where(
-            BattleSegment.battle_id == battle_id,
-            BattleSegment.kind == kind
-        )
-    )
-    segments_of_kind = result.scalars().all()
-    
     # If both players submitted, advance to next segment
-    if len(segments_of_kind) >= 2:  # Will be 2 after this commit
+    if prev_count + 1 >= 2:  # Will be 2 after this commit
         if kind == "opening":
             battle.current_segment = "rebuttal"
             battle.current_turn = battle.player1_id  # Player 1 starts rebuttal
@@ -1078,29 +1284,30 @@ async def judge_battle(
     db: AsyncSession = Depends(get_db)
 ):
     """Use Gemini to judge the battle and determine winner"""
-    from sqlalchemy import select, func
-    
-    # Get battle
-    result = await db.execute(select(Battle).where(Battle.id == battle_id))
-    battle = result.scalars().first()
-    
+
+    # Battle, segments (ordered by creation), topic, and both players in one query
+    battle = await db.get(
+        Battle,
+        battle_id,
+        options=[
+            selectinload(Battle.segments),
+            joinedload(Battle.topic),
+            joinedload(Battle.player1),
+            joinedload(Battle.player2)
+        ]
+    )
+
     if not battle:
         raise HTTPException(status_code=404, detail="Battle not found")
-    
+
     if battle.status != "in_progress":
         raise HTTPException(status_code=400, detail="Battle is not in progress")
-    
+
     # Verify user is a participant
     if current_user.id not in [battle.player1_id, battle.player2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this battle")
-    
-    # Get all segments
-    result = await db.execute(
-        select(BattleSegment)
-        .where(BattleSegment.battle_id == battle_id)
-        .order_by(BattleSegment.created_at)
-    )
-    segments = result.scalars().all()
+
+    segments = battle.segments
     
     # Organize segments by player
     player1_segments = {}
@@ -1119,15 +1326,9 @@ async def judge_battle(
     if not all(k in player2_segments for k in required_kinds):
         raise HTTPException(status_code=400, detail="Player 2 has not submitted all segments")
     
-    # Get topic
-    result = await db.execute(select(Topic).where(Topic.id == battle.topic_id))
-    topic = result.scalars().first()
-    
-    # Get player names
-    result = await db.execute(select(User).where(User.id == battle.player1_id))
-    player1 = result.scalars().first()
-    result = await db.execute(select(User).where(User.id == battle.player2_id))
-    player2 = result.scalars().first()
+    topic = battle.topic
+    player1 = battle.player1
+    player2 = battle.player2
     
     # Create judgment prompt
     prompt = f"""You are an expert debate judge evaluating a 1v1 debate.
@@ -1180,35 +1381,54 @@ Provide your judgment in the following JSON format:
 
 Return ONLY the JSON object, no additional text."""
     
-    # Get judgment from Gemini
-    import json
-    judgment_text = await gemini_service.generate_text(prompt, response_format="json")
-    
-    # Parse JSON (remove markdown code blocks if present)
-    judgment_text = judgment_text.strip()
-    if judgment_text.startswith("```json"):
-        judgment_text = judgment_text[7:]
-    if judgment_text.startswith("```"):
-        judgment_text = judgment_text[3:]
-    if judgment_text.endswith("```"):
-        judgment_text = judgment_text[:-3]
-    judgment_text = judgment_text.strip()
-    
-    judgment = json.loads(judgment_text)
-    
-    # Determine winner
-    winner_id = battle.player1_id if judgment["winner"] == "player1" else battle.player2_id
-    
-    # Update battle
-    battle.status = "completed"
-    battle.winner_id = winner_id
-    battle.judgment = judgment
-    battle.completed_at = func.now()
-    
-    await db.commit()
-    
-    # Update user stats for both players
-    await update_user_stats_for_battle(battle, db)
+    async with _keyed_lock(_JUDGE_LOCKS, battle_id):
+        # Re-check under the lock: a concurrent call may have judged the
+        # battle while this one was waiting, and Gemini must be paid once
+        status_now = (await db.execute(
+            select(Battle.status).where(Battle.id == battle_id)
+        )).scalar()
+        if status_now != "in_progress":
+            raise HTTPException(status_code=409, detail="Battle has already been judged")
+
+        # Get judgment from Gemini
+        judgment_text = await get_gemini_service().generate_text(prompt, response_format="json", cacheable=True)
+    
+        # Parse JSON (remove markdown code fences if present)
+        judgment_text = _FENCE_RE.sub("", judgment_text).strip()
+
+        judgment = orjson.loads(judgment_text)
+    
+        # Determine winner
+        winner_id = battle.player1_id if judgment["winner"] == "player1" else battle.player2_id
+    
+        # Guarded atomic UPDATE: only the first concurrent /judge call can flip
+        # the battle out of in_progress, so stats are applied exactly once
+        updated = (await db.execute(
+            update(Battle)
+            .where(Battle.id == battle_id, Battle.status == "in_progress")
+            .values(
+                status="completed",
+                winner_id=winner_id,
+                judgment=judgment,
+                completed_at=func.now()
+            )
+            .returning(Battle.id)
+        )).first()
+
+        if updated is None:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Battle has already been judged")
+
+        await db.commit()
+
+        # Reflect the outcome on the loaded instance (detached so the stats
+        # commit below doesn't re-issue the same UPDATE) instead of re-fetching
+        db.expunge(battle)
+        battle.status = "completed"
+        battle.winner_id = winner_id
+
+        # Update user stats for both players
+        await update_user_stats_for_battle(battle, db)
     
     return {
         "battle_id": battle.id,
@@ -1228,13 +1448,15 @@ async def transcribe_audio(
     """
     Transcribe audio file to text using Whisper
     """
-    import tempfile
-    import shutil
     
     try:
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.m4a') as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
+        # Stream the upload to a temp file in 1 MiB chunks; both the reads
+        # and the writes are async so the event loop never blocks on I/O
+        async with aiofiles.tempfile.NamedTemporaryFile(
+            'wb', suffix='.m4a', delete=False
+        ) as temp_file:
+            while chunk := await file.read(1 << 20):
+                await temp_file.write(chunk)
             temp_path = temp_file.name
         
         # Transcribe using Whisper
@@ -1242,7 +1464,7 @@ async def transcribe_audio(
         
         # Clean up temp file
         try:
-            os.remove(temp_path)
+            await asyncio.to_thread(os.remove, temp_path)
         except Exception as e:
             print(f"Failed to clean up temp file: {e}")
         
@@ -1,8 +1,9 @@
 """
 Database models for debAIDe
 """
-from sqlalchemy import Column, String, Integer, Text, Float, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Text, Float, DateTime, ForeignKey, Index, Computed, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 
@@ -10,7 +11,13 @@ from database import Base
 class User(Base):
     """User model for tracking debate participants"""
     __tablename__ = "users"
-    
+
+    # Covering indexes so login/auth lookups are index-only scans
+    __table_args__ = (
+        Index("ix_users_username_covering", "username", postgresql_include=["id", "hashed_password", "email"]),
+        Index("ix_users_email_covering", "email", postgresql_include=["id"]),
+    )
+
     id = Column(String, primary_key=True)  # UUID
     username = Column(String, unique=True, nullable=False)
     email = Column(String, unique=True, nullable=False)
@@ -29,6 +36,11 @@ class User(Base):
 class Topic(Base):
     """Debate topics"""
     __tablename__ = "topics"
+
+    # /topics/daily filters and orders on created_at
+    __table_args__ = (
+        Index("ix_topics_created_at", text("created_at DESC")),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String, nullable=False)
@@ -63,6 +75,11 @@ class Session(Base):
 class Segment(Base):
     """Audio segment within a debate session"""
     __tablename__ = "segments"
+
+    # Session scoring and history always fetch segments by session
+    __table_args__ = (
+        Index("ix_segments_session_id", "session_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String, ForeignKey("sessions.id"), nullable=False)
@@ -70,6 +87,7 @@ class Segment(Base):
     audio_url = Column(String, nullable=True)  # NULL for text-only submissions
     transcript = Column(Text)
     duration = Column(Float, default=0.0)  # in seconds
+    status = Column(String, default="done")  # pending, done, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -88,12 +106,18 @@ class Scorecard(Base):
     logic_score = Column(Float, nullable=False)
     delivery_score = Column(Float, nullable=False)
     time_use_score = Column(Float, nullable=False)
-    total_score = Column(Float, nullable=False)  # 0-20
+    # Generated server-side so it can never drift from the components
+    total_score = Column(
+        Float,
+        Computed("structure_score + logic_score + delivery_score + time_use_score", persisted=True),
+        nullable=False
+    )  # 0-20
     
-    # Feedback
-    feedback = Column(JSON)  # Structured feedback from AI
-    highlights = Column(JSON)  # Key moments with timestamps
-    drills = Column(JSON)  # Recommended practice drills
+    # Feedback: deferred so score-only reads skip the large JSON payloads;
+    # endpoints that need them opt in with undefer()
+    feedback = deferred(Column(JSONB))  # Structured feedback from AI
+    highlights = deferred(Column(JSONB))  # Key moments with timestamps
+    drills = deferred(Column(JSONB))  # Recommended practice drills
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -104,7 +128,20 @@ class Scorecard(Base):
 class Battle(Base):
     """1v1 Battle between two users"""
     __tablename__ = "battles"
-    
+
+    # At most one waiting battle per creator, enforced by the database so
+    # /battle/create can upsert instead of DELETE + INSERT
+    __table_args__ = (
+        Index(
+            "ix_battles_player1_waiting",
+            "player1_id",
+            unique=True,
+            postgresql_where=text("status = 'waiting'"),
+        ),
+        # /battle/available filters on status and excludes the caller
+        Index("ix_battles_status_player1", "status", "player1_id"),
+    )
+
     id = Column(String, primary_key=True)  # UUID
     topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False)
     player1_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -115,7 +152,7 @@ class Battle(Base):
     player2_stance = Column(String, nullable=True)  # opposite of player1
     current_turn = Column(String, nullable=True)  # player_id whose turn it is
     current_segment = Column(String, default="opening")  # opening, rebuttal, closing
-    judgment = Column(JSON, nullable=True)  # Full judgment from Gemini
+    judgment = Column(JSONB, nullable=True)  # Full judgment from Gemini
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
@@ -124,12 +161,22 @@ class Battle(Base):
     player1 = relationship("User", foreign_keys=[player1_id], back_populates="player1_battles")
     player2 = relationship("User", foreign_keys=[player2_id], back_populates="player2_battles")
     winner = relationship("User", foreign_keys=[winner_id], back_populates="won_battles")
-    segments = relationship("BattleSegment", back_populates="battle", cascade="all, delete-orphan")
+    segments = relationship(
+        "BattleSegment",
+        back_populates="battle",
+        cascade="all, delete-orphan",
+        order_by="BattleSegment.created_at"
+    )
 
 
 class BattleSegment(Base):
     """Individual segments within a battle"""
     __tablename__ = "battle_segments"
+
+    # Status flags and the per-kind count both filter on these two columns
+    __table_args__ = (
+        Index("ix_battle_segments_battle_kind", "battle_id", "kind"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     battle_id = Column(String, ForeignKey("battles.id"), nullable=False)
@@ -148,7 +195,33 @@ class BattleSegment(Base):
 class UserStats(Base):
     """User statistics and progress tracking"""
     __tablename__ = "user_stats"
-    
+
+    # Covering index turns the /user/stats lookup into an index-only scan
+    __table_args__ = (
+        Index(
+            "ix_user_stats_user_id_covering",
+            "user_id",
+            unique=True,
+            postgresql_include=[
+                "total_practice_sessions",
+                "completed_practice_sessions",
+                "average_practice_score",
+                "total_battles",
+                "battles_won",
+                "battles_lost",
+                "current_win_streak",
+                "best_win_streak",
+                "avg_structure_score",
+                "avg_logic_score",
+                "avg_delivery_score",
+                "avg_time_use_score",
+                "total_debate_time",
+                "last_activity",
+                "favorite_stance",
+            ],
+        ),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, unique=True)
     
@@ -169,6 +242,14 @@ class UserStats(Base):
     avg_logic_score = Column(Float, default=0.0)
     avg_delivery_score = Column(Float, default=0.0)
     avg_time_use_score = Column(Float, default=0.0)
+
+    # Running sums backing the averages; updates are pure additions so the
+    # stored averages never accumulate rounding drift
+    sum_structure_score = Column(Float, default=0.0)
+    sum_logic_score = Column(Float, default=0.0)
+    sum_delivery_score = Column(Float, default=0.0)
+    sum_time_use_score = Column(Float, default=0.0)
+    sum_total_score = Column(Float, default=0.0)
     
     # Activity tracking
     total_debate_time = Column(Float, default=0.0)  # in seconds
@@ -176,7 +257,7 @@ class UserStats(Base):
     
     # Additional metrics
     favorite_stance = Column(String, nullable=True)  # 'pro' or 'con'
-    topics_debated = Column(JSON, default={})  # topic_id: count
+    topics_debated = deferred(Column(JSONB, default=dict))  # topic_id: count
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,34 +1,55 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
+# Closed string vocabularies: pydantic-core validates Literal fields by
+# interned comparison instead of accepting any str, and typos in callers
+# surface statically
+DifficultyLit = Literal["easy", "medium", "hard"]
+CategoryLit = Literal[
+    "politics", "technology", "ethics", "environment",
+    "education", "health", "economics"
+]
+StanceLit = Literal["pro", "con"]
 
-class SessionStartRequest(BaseModel):
+
+class APIModel(BaseModel):
+    """Shared base for all API schemas
+
+    defer_build postpones pydantic-core schema construction from import
+    time to first use, and extra='ignore' skips scanning for unexpected
+    fields during validation.
+    """
+    model_config = ConfigDict(defer_build=True, extra='ignore')
+
+
+class SessionStartRequest(APIModel):
     """Request to start a new debate session"""
     topic_id: int
     user_id: Optional[str] = None
 
 
-class SessionStartResponse(BaseModel):
+class SessionStartResponse(APIModel):
     """Response when starting a new session"""
     session_id: str
     topic_title: str
     topic_description: Optional[str] = None
-    stance: str  # 'pro' or 'con'
+    stance: StanceLit
 
 
-class SegmentUploadResponse(BaseModel):
+class SegmentUploadResponse(APIModel):
     """Response after uploading an audio segment"""
     segment_id: int
-    transcript: str
+    transcript: Optional[str] = None  # None while transcription is pending
     audio_url: str | None  # Optional for text submissions
     duration: float
+    status: str = "done"  # 'pending', 'done', or 'failed'
 
 
-class ScoreBreakdown(BaseModel):
+class ScoreBreakdown(APIModel):
     """Individual score breakdown"""
     structure: float = Field(..., ge=0, le=5)
     logic: float = Field(..., ge=0, le=5)
@@ -37,14 +58,14 @@ class ScoreBreakdown(BaseModel):
     total: float = Field(..., ge=0, le=20)
 
 
-class Highlight(BaseModel):
+class Highlight(APIModel):
     """Highlighted moment in the debate"""
     timestamp: float
     text: str
     reason: str
 
 
-class ScoreResponse(BaseModel):
+class ScoreResponse(APIModel):
     """Response after scoring a debate session"""
     session_id: str
     scores: ScoreBreakdown
@@ -53,18 +74,18 @@ class ScoreResponse(BaseModel):
     drills: List[Any]  # Can be strings or objects with drill_name/description
 
 
-class TopicResponse(BaseModel):
+class TopicResponse(APIModel):
     """Debate topic response"""
     id: int
     title: str
     description: Optional[str] = None
-    difficulty: str
-    category: Optional[str] = None
+    difficulty: DifficultyLit
+    category: Optional[CategoryLit] = None
 
 
-class TopicGeneration(BaseModel):
+class TopicGeneration(APIModel):
     """Generated topic from AI"""
     title: str
     description: str
-    difficulty: str
-    category: str
+    difficulty: DifficultyLit
+    category: CategoryLit
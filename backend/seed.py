@@ -2,9 +2,15 @@
 Seed script to populate database with initial debate topics
 """
 import asyncio
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import AsyncSessionLocal, init_db
 from models import Topic
+from schemas import TopicGeneration
+
+# Validates the whole fixture list in one pydantic-core pass
+_TOPIC_ADAPTER = TypeAdapter(list[TopicGeneration])
 
 
 async def seed_topics():
@@ -78,20 +84,19 @@ async def seed_topics():
     
     # Create session
     async with AsyncSessionLocal() as session:
-        # Check if topics already exist
-        from sqlalchemy import select
-        result = await session.execute(select(Topic))
-        existing_topics = result.scalars().all()
+        # Check if topics already exist; a scalar count avoids pulling rows
+        existing_count = (await session.execute(
+            select(func.count()).select_from(Topic)
+        )).scalar()
         
-        if existing_topics:
-            print(f"Database already has {len(existing_topics)} topics. Skipping seed.")
+        if existing_count:
+            print(f"Database already has {existing_count} topics. Skipping seed.")
             return
         
-        # Add topics
-        for topic_data in initial_topics:
-            topic = Topic(**topic_data)
-            session.add(topic)
-        
+        # Validate every fixture dict in a single Rust-side batch, then one
+        # bulk INSERT via the insertmanyvalues fast path
+        validated = _TOPIC_ADAPTER.validate_python(initial_topics)
+        await session.execute(insert(Topic), [t.model_dump() for t in validated])
         await session.commit()
         print(f"✅ Successfully seeded {len(initial_topics)} debate topics!")
 
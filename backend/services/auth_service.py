@@ -2,59 +2,130 @@
 Authentication service for debAIDe
 Handles password hashing and JWT token generation
 """
+import asyncio
+import base64
 import bcrypt
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
-import os
+from jose import JWTError, jwk, jwt
+from jose.utils import base64url_encode
+from datetime import timedelta
+from cachetools import TTLCache
 import hashlib
+import hmac
+import orjson
+import os
+import threading
+import time
 
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "debaide-super-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Bcrypt cost factor: each +1 doubles hashing time. 12 (~250ms) is the
+# production default; dev and seed runs can drop to 4 to speed bootstrap.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    # Pre-hash to handle passwords longer than 72 bytes
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash
+
+    bcrypt is deliberately slow (~100ms at default cost), so the check runs
+    in a worker thread instead of stalling the event loop.
+    """
     password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = hashlib.sha256(password_bytes).hexdigest().encode('utf-8')
-    
-    return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+    hashed = hashed_password.encode('utf-8')
+    if len(password_bytes) <= 72:
+        return await asyncio.to_thread(bcrypt.checkpw, password_bytes, hashed)
 
+    # Pre-hash to handle passwords longer than 72 bytes. New hashes use the
+    # base64 of the sha256 digest (44 bytes, never NUL — bcrypt>=4 rejects
+    # NUL bytes); older accounts may hold raw-digest or hex-digest hashes,
+    # so fall back through those forms.
+    digest = hashlib.sha256(password_bytes).digest()
+    if await asyncio.to_thread(bcrypt.checkpw, base64.b64encode(digest), hashed):
+        return True
+    if b"\x00" not in digest and await asyncio.to_thread(bcrypt.checkpw, digest, hashed):
+        return True
+    return await asyncio.to_thread(bcrypt.checkpw, digest.hex().encode('ascii'), hashed)
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    # Bcrypt has a 72-byte limit, so pre-hash long passwords
+
+async def get_password_hash(password: str) -> str:
+    """Hash a password in a worker thread (see verify_password)"""
+    # Bcrypt has a 72-byte limit, so pre-hash long passwords; base64 keeps
+    # the digest NUL-free, which bcrypt>=4 requires
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
-        password_bytes = hashlib.sha256(password_bytes).hexdigest().encode('utf-8')
-    
-    # Generate salt and hash
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+        password_bytes = base64.b64encode(hashlib.sha256(password_bytes).digest())
+
+    def _hash() -> str:
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+
+    return await asyncio.to_thread(_hash)
+
+
+# The JWT header is identical for every token this service issues, so it is
+# serialized and base64url-encoded once at import instead of per call
+_HEADER_B64 = base64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+_SECRET_BYTES = SECRET_KEY.encode('utf-8')
+
+# Pre-built HMAC key object: jwt.decode accepts it directly, skipping the
+# string-to-key construction it would otherwise repeat on every call
+_VERIFY_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+
+# Keyed HMAC state computed once; .copy() clones the inner/outer digests so
+# each signature pays only for the message blocks, not the key schedule
+_HMAC_PROTO = hmac.new(_SECRET_BYTES, digestmod=hashlib.sha256)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
     
+    # Integer Unix seconds throughout (per the JWT spec) skip the datetime
+    # construction and conversion the old utcnow() arithmetic paid per token
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode["exp"] = expire
+    to_encode.setdefault("iat", now)
+
+    # Same wire format jwt.encode produces: payload serialize, one HMAC,
+    # two base64url passes, with the constant header reused
+    signing_input = _HEADER_B64 + b"." + base64url_encode(orjson.dumps(to_encode))
+    mac = _HMAC_PROTO.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + base64url_encode(mac.digest())).decode('ascii')
+
+
+# Verified-payload cache: the same token recurs on every request from a
+# client, so skip redoing the HMAC verification within a short window.
+# Keyed on a token digest (never the raw token) and bounded by a 30-second
+# TTL, which also caps staleness if tokens are ever revoked.
+_DECODE_CACHE = TTLCache(maxsize=10000, ttl=30)
+_DECODE_CACHE_LOCK = threading.Lock()
 
 
 def decode_access_token(token: str) -> dict:
     """Decode and verify a JWT token"""
+    key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+    with _DECODE_CACHE_LOCK:
+        payload = _DECODE_CACHE.get(key)
+
+    if payload is not None:
+        # Expiry is enforced on every hit, not only at verification time
+        return payload if payload.get("exp", 0) > time.time() else None
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _VERIFY_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+    with _DECODE_CACHE_LOCK:
+        _DECODE_CACHE[key] = payload
+
+    return payload
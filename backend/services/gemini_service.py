@@ -1,16 +1,88 @@
 """
 Gemini AI service for scoring, feedback, and topic generation
 """
+import copy
+import hashlib
 import os
-import json
+import orjson
 import google.generativeai as genai
 from typing import Dict, Any, List
 
+# Fallback payloads built once at import; handed out as deep copies so a
+# caller mutating its response can't poison later ones
+_FALLBACK_TOPIC = {
+    "title": "Artificial intelligence will improve quality of life more than it will harm it",
+    "description": "This topic explores the balance between AI's benefits and risks as it becomes increasingly integrated into daily life.",
+    "difficulty": "medium",
+    "category": "technology"
+}
+
+_FALLBACK_SCORING = {
+    "scores": {
+        "structure": 3.0,
+        "logic": 3.0,
+        "delivery": 3.0,
+        "time_use": 3.0,
+        "total": 12.0
+    },
+    "feedback": {
+        "strengths": ["You completed all segments", "Good effort"],
+        "improvements": ["Practice more", "Work on clarity"],
+        "summary": "Keep practicing to improve your debate skills."
+    },
+    "highlights": [],
+    "drills": [
+        "Practice outlining arguments in advance",
+        "Record yourself and listen back",
+        "Time your segments during practice"
+    ]
+}
+
+
+# Static prompt body allocated once; per-call work is reduced to joining the
+# segment lines and one format_map substitution
+_SCORING_TEMPLATE = """
+You are an expert debate coach scoring a practice debate. Analyze the following debate performance.
+
+**Topic:** {topic}
+**Stance:** {stance}
+
+**Debate Transcript:**
+{segments_text}
+
+Provide a structured evaluation in JSON format with:
+
+1. **scores** (object):
+   - structure: 0-5 (organization, clarity of arguments)
+   - logic: 0-5 (reasoning, evidence, coherence)
+   - delivery: 0-5 (confidence, pace, articulation)
+   - time_use: 0-5 (pacing, time management)
+   - total: 0-20 (sum of above)
+
+2. **feedback** (object with detailed coaching):
+   - strengths: List 2-3 specific strengths
+   - improvements: List 2-3 areas to improve
+   - summary: 2-3 sentence overall assessment
+
+3. **highlights** (array of 2-3 key moments):
+   Each with: timestamp (float seconds), text (key phrase), reason (why it's notable)
+
+4. **drills** (array of 3-4 practice exercises):
+   Specific, actionable drills to improve weak areas
+
+Be constructive, specific, and encouraging. Focus on actionable feedback.
+        """
+
 
 class GeminiService:
     """Service for interacting with Google Gemini API"""
-    
+
+    # Content-addressed result cache: identical transcripts always produce an
+    # equivalent judgment, so retries and page reloads skip the LLM call
+    RESULT_CACHE_MAX = 512
+
     def __init__(self):
+        self._result_cache = {}
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             print("⚠️  Warning: GEMINI_API_KEY not set. AI features will return mock data.")
@@ -25,6 +97,21 @@ class GeminiService:
                 print(f"⚠️  Warning: Invalid GEMINI_API_KEY. AI features will return mock data. Error: {e}")
                 self.model = None
     
+    async def _generate(self, prompt: str, generation_config: "genai.GenerationConfig") -> str:
+        """Run a streamed generation on the SDK's async transport
+
+        generate_content_async rides the SDK's persistent async channel, so
+        consecutive calls reuse the connection instead of paying a fresh
+        TLS handshake each time, and stream=True yields chunks as they
+        arrive instead of buffering the whole response.
+        """
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            stream=True
+        )
+        return "".join([chunk.text async for chunk in response])
+
     async def score_debate(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Score a debate session using Gemini
@@ -39,32 +126,40 @@ class GeminiService:
         if not self.model:
             print("ℹ️  Using mock scoring (no valid Gemini API key)")
             return self._fallback_scoring()
-        
+
+        cache_key = "score:" + self._content_key(session_data)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = self._build_scoring_prompt(session_data)
         
         try:
-            response = self.model.generate_content(
+            text = await self._generate(
                 prompt,
-                generation_config=genai.GenerationConfig(
+                genai.GenerationConfig(
                     response_mime_type="application/json",
                     temperature=0.7
                 )
             )
             
-            result = json.loads(response.text)
+            result = orjson.loads(text)
+            self._cache_result(cache_key, result)
             return result
             
         except Exception as e:
             print(f"❌ Gemini scoring error: {e}")
             return self._fallback_scoring()
     
-    async def generate_text(self, prompt: str, response_format: str = "text") -> str:
+    async def generate_text(self, prompt: str, response_format: str = "text", cacheable: bool = False) -> str:
         """
         Generate text using Gemini with a given prompt
         
         Args:
             prompt: The prompt to send to Gemini
             response_format: "text" or "json" for response format
+            cacheable: cache the result by prompt hash (only for prompts that
+                are deterministic functions of their inputs, e.g. judgments)
         
         Returns:
             Generated text response
@@ -72,22 +167,29 @@ class GeminiService:
         if not self.model:
             print("ℹ️  Using mock text generation (no valid Gemini API key)")
             return '{"error": "No Gemini API key configured"}'
-        
+
+        cache_key = None
+        if cacheable:
+            cache_key = "text:" + self._content_key(prompt)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             config_params = {"temperature": 0.7}
             if response_format == "json":
                 config_params["response_mime_type"] = "application/json"
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(**config_params)
-            )
+            text = await self._generate(prompt, genai.GenerationConfig(**config_params))
             
-            return response.text
+            if cache_key is not None:
+                self._cache_result(cache_key, text)
+            return text
             
         except Exception as e:
             print(f"❌ Gemini text generation error: {e}")
-            return f'{{"error": "{str(e)}"}}'
+            # orjson handles quoting, so error text can't break the JSON
+            return orjson.dumps({"error": str(e)}).decode()
     
     async def generate_daily_topic(self) -> Dict[str, str]:
         """
@@ -99,12 +201,7 @@ class GeminiService:
         # Return mock topic if no valid model
         if not self.model:
             print("ℹ️  Using mock topic (no valid Gemini API key)")
-            return {
-                "title": "Artificial intelligence will improve quality of life more than it will harm it",
-                "description": "This topic explores the balance between AI's benefits and risks as it becomes increasingly integrated into daily life.",
-                "difficulty": "medium",
-                "category": "technology"
-            }
+            return copy.deepcopy(_FALLBACK_TOPIC)
         
         prompt = """
 Generate an engaging debate topic for practice. Return a JSON object with:
@@ -117,87 +214,64 @@ Make it current, relevant, and suitable for practicing argumentation skills.
         """
         
         try:
-            response = self.model.generate_content(
+            text = await self._generate(
                 prompt,
-                generation_config=genai.GenerationConfig(
+                genai.GenerationConfig(
                     response_mime_type="application/json",
                     temperature=0.9
                 )
             )
             
-            result = json.loads(response.text)
+            result = orjson.loads(text)
             return result
             
         except Exception as e:
             print(f"Gemini topic generation error: {e}")
             # Return fallback topic
-            return {
-                "title": "Artificial intelligence will improve quality of life more than it will harm it",
-                "description": "This topic explores the balance between AI's benefits and risks as it becomes increasingly integrated into daily life.",
-                "difficulty": "medium",
-                "category": "technology"
-            }
+            return copy.deepcopy(_FALLBACK_TOPIC)
     
+    @staticmethod
+    def _content_key(payload: Any) -> str:
+        """Stable hash of a prompt or session payload for cache keying"""
+        canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.sha256(canonical).hexdigest()
+
+    def _cache_result(self, key: str, value: Any):
+        """Insert into the bounded result cache, evicting oldest first"""
+        if len(self._result_cache) >= self.RESULT_CACHE_MAX:
+            self._result_cache.pop(next(iter(self._result_cache)))
+        self._result_cache[key] = value
+
     def _build_scoring_prompt(self, session_data: Dict[str, Any]) -> str:
         """Build the prompt for debate scoring"""
-        segments_text = "\n\n".join([
-            f"**{seg['kind'].upper()}** ({seg['duration']}s):\n{seg['transcript']}"
-            for seg in session_data["segments"]
-        ])
+        segments_text = "\n\n".join(
+            f"**{kind.upper()}** ({duration}s):\n{transcript}"
+            for kind, duration, transcript in zip(
+                session_data["segment_kinds"],
+                session_data["segment_durations"],
+                session_data["segment_transcripts"]
+            )
+        )
         
-        prompt = f"""
-You are an expert debate coach scoring a practice debate. Analyze the following debate performance.
-
-**Topic:** {session_data['topic']}
-**Stance:** {session_data['stance']}
-
-**Debate Transcript:**
-{segments_text}
-
-Provide a structured evaluation in JSON format with:
-
-1. **scores** (object):
-   - structure: 0-5 (organization, clarity of arguments)
-   - logic: 0-5 (reasoning, evidence, coherence)
-   - delivery: 0-5 (confidence, pace, articulation)
-   - time_use: 0-5 (pacing, time management)
-   - total: 0-20 (sum of above)
+        return _SCORING_TEMPLATE.format_map({
+            "topic": session_data["topic"],
+            "stance": session_data["stance"],
+            "segments_text": segments_text
+        })
+    
+    def _fallback_scoring(self) -> Dict[str, Any]:
+        """Fallback scoring if Gemini fails"""
+        return copy.deepcopy(_FALLBACK_SCORING)
 
-2. **feedback** (object with detailed coaching):
-   - strengths: List 2-3 specific strengths
-   - improvements: List 2-3 areas to improve
-   - summary: 2-3 sentence overall assessment
 
-3. **highlights** (array of 2-3 key moments):
-   Each with: timestamp (float seconds), text (key phrase), reason (why it's notable)
+# Shared process-wide instance, created lazily on first use so importing the
+# module doesn't configure the SDK or build the model object
+_instance = None
 
-4. **drills** (array of 3-4 practice exercises):
-   Specific, actionable drills to improve weak areas
 
-Be constructive, specific, and encouraging. Focus on actionable feedback.
-        """
-        
-        return prompt
-    
-    def _fallback_scoring(self) -> Dict[str, Any]:
-        """Fallback scoring if Gemini fails"""
-        return {
-            "scores": {
-                "structure": 3.0,
-                "logic": 3.0,
-                "delivery": 3.0,
-                "time_use": 3.0,
-                "total": 12.0
-            },
-            "feedback": {
-                "strengths": ["You completed all segments", "Good effort"],
-                "improvements": ["Practice more", "Work on clarity"],
-                "summary": "Keep practicing to improve your debate skills."
-            },
-            "highlights": [],
-            "drills": [
-                "Practice outlining arguments in advance",
-                "Record yourself and listen back",
-                "Time your segments during practice"
-            ]
-        }
+def get_gemini_service() -> GeminiService:
+    """Return the shared GeminiService, creating it on first call"""
+    global _instance
+    if _instance is None:
+        _instance = GeminiService()
+    return _instance
@@ -1,13 +1,24 @@
 """
 Storage service for audio file management
 """
+import asyncio
 import os
+import shutil
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
 import uuid
+from pathlib import Path
 from typing import Optional
 
+# 8 MiB multipart chunks keep peak memory constant regardless of file size
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    use_threads=True
+)
+
 
 class StorageService:
     """Service for managing audio file storage"""
@@ -57,45 +68,93 @@ class StorageService:
         else:
             return await self._upload_to_local(file, filename)
     
+    async def upload_audio_path(
+        self,
+        path: str,
+        session_id: str,
+        segment_kind: str,
+        content_type: Optional[str] = None,
+        original_filename: Optional[str] = None
+    ) -> str:
+        """
+        Upload an audio file already spooled to a local path
+
+        Lets callers reuse one temp file for both storage and transcription
+        instead of consuming the UploadFile stream twice.
+        """
+        file_extension = original_filename.split('.')[-1] if original_filename else 'webm'
+        filename = f"{session_id}/{segment_kind}_{uuid.uuid4()}.{file_extension}"
+
+        if self.use_s3:
+            try:
+                await asyncio.to_thread(
+                    self.s3_client.upload_file,
+                    path,
+                    self.bucket_name,
+                    filename,
+                    ExtraArgs={"ContentType": content_type or 'audio/webm'},
+                    Config=_TRANSFER_CONFIG
+                )
+                return f"https://{self.bucket_name}.s3.amazonaws.com/{filename}"
+            except ClientError as e:
+                raise Exception(f"S3 upload failed: {e}")
+
+        try:
+            file_path = os.path.join(self.local_storage_path, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            await asyncio.to_thread(shutil.copyfile, path, file_path)
+            return f"/storage/audio/{filename}"
+        except Exception as e:
+            raise Exception(f"Local storage failed: {e}")
+
     async def _upload_to_s3(self, file: UploadFile, filename: str) -> str:
         """Upload file to S3"""
         try:
-            # Read file content
-            content = await file.read()
-            
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=filename,
-                Body=content,
-                ContentType=file.content_type or 'audio/webm'
+            # Stream straight from the spooled upload; multipart keeps RSS flat
+            # and to_thread keeps the blocking boto3 call off the event loop
+            await asyncio.to_thread(
+                self.s3_client.upload_fileobj,
+                file.file,
+                self.bucket_name,
+                filename,
+                ExtraArgs={"ContentType": file.content_type or 'audio/webm'},
+                Config=_TRANSFER_CONFIG
             )
-            
+
             # Generate URL
             url = f"https://{self.bucket_name}.s3.amazonaws.com/{filename}"
             return url
-            
+
         except ClientError as e:
             raise Exception(f"S3 upload failed: {e}")
-    
+
     async def _upload_to_local(self, file: UploadFile, filename: str) -> str:
         """Upload file to local storage"""
         try:
             # Create directory if needed
             file_path = os.path.join(self.local_storage_path, filename)
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # Write file
-            content = await file.read()
-            with open(file_path, 'wb') as f:
-                f.write(content)
-            
+
+            # Copy in fixed 1 MiB chunks instead of buffering the whole file
+            def _copy():
+                with open(file_path, 'wb') as f:
+                    shutil.copyfileobj(file.file, f, length=1 << 20)
+
+            await asyncio.to_thread(_copy)
+
             # Return relative path or URL
             return f"/storage/audio/{filename}"
-            
+
         except Exception as e:
             raise Exception(f"Local storage failed: {e}")
     
+    def resolve_local_path(self, audio_url: str) -> str:
+        """Translate a stored audio URL into a local filesystem path"""
+        if audio_url.startswith('/storage/audio/'):
+            return str(Path(self.local_storage_path) / audio_url[len('/storage/audio/'):])
+        # S3 (or already-local) references pass through unchanged
+        return audio_url
+
     def get_file_url(self, file_path: str) -> str:
         """Get accessible URL for a stored file"""
         if self.use_s3:
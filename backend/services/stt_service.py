@@ -1,17 +1,24 @@
 """
 Speech-to-Text service for audio transcription
 """
+import asyncio
 import os
-import ssl
 from typing import Dict, Any
-import whisper
+from faster_whisper import WhisperModel
 
 
 class STTService:
     """Service for speech-to-text transcription"""
-    
+
+    # Micro-batching knobs: coalesce concurrent requests that arrive within
+    # the window into one worker-thread hop through the model
+    BATCH_MAX_SIZE = 8
+    BATCH_WINDOW_SECONDS = 0.01
+
     def __init__(self):
         self.use_google_stt = os.getenv("USE_GOOGLE_STT", "false").lower() == "true"
+        self._batch_queue = None
+        self._batch_worker = None
         
         if self.use_google_stt:
             from google.cloud import speech
@@ -21,36 +28,43 @@ class STTService:
             # Use Whisper for transcription
             try:
                 print("🔄 Loading Whisper model (this may take a moment)...")
-                # Bypass SSL verification for model download
-                ssl._create_default_https_context = ssl._create_unverified_context
-                self.whisper_model = whisper.load_model("base")
+                # int8 quantized weights: 2-4x faster and ~4x less RAM than FP32.
+                # The model dir is shared so the mmap'd weights are reused by
+                # all workers; bake it into the image to avoid cold downloads.
+                self.whisper_model = WhisperModel(
+                    "base",
+                    device="auto",
+                    compute_type="int8_float16",
+                    download_root=os.getenv("WHISPER_MODEL_DIR")
+                )
                 print("✅ Whisper STT initialized successfully")
             except Exception as e:
                 print(f"⚠️  Warning: Failed to load Whisper model. Error: {e}")
                 self.whisper_model = None
     
-    async def transcribe(self, audio_url: str) -> Dict[str, Any]:
+    async def transcribe(self, audio_path: str) -> Dict[str, Any]:
         """
         Transcribe audio to text
-        
+
         Args:
-            audio_url: URL or path to audio file
-        
+            audio_path: local filesystem path to the audio file
+                (use StorageService.resolve_local_path on stored URLs)
+
         Returns:
             Dict with 'text' (transcript) and 'duration' (seconds)
         """
         if self.use_google_stt:
-            return await self._transcribe_with_google(audio_url)
+            return await self._transcribe_with_google(audio_path)
         else:
-            return await self._transcribe_with_whisper(audio_url)
+            return await self._transcribe_with_whisper(audio_path)
     
-    async def _transcribe_with_google(self, audio_url: str) -> Dict[str, Any]:
+    async def _transcribe_with_google(self, audio_path: str) -> Dict[str, Any]:
         """Transcribe using Google Speech-to-Text"""
         from google.cloud import speech
-        
+
         try:
             # Read audio file
-            with open(audio_url.replace('/storage/audio/', './storage/audio/'), 'rb') as audio_file:
+            with open(audio_path, 'rb') as audio_file:
                 content = audio_file.read()
             
             audio = speech.RecognitionAudio(content=content)
@@ -87,7 +101,7 @@ class STTService:
             print(f"Google STT error: {e}")
             return self._fallback_transcript()
     
-    async def _transcribe_with_whisper(self, audio_url: str) -> Dict[str, Any]:
+    async def _transcribe_with_whisper(self, audio_path: str) -> Dict[str, Any]:
         """
         Transcribe using OpenAI Whisper
         """
@@ -100,35 +114,9 @@ class STTService:
             }
         
         try:
-            # Read audio file
-            audio_path = audio_url.replace('/storage/audio/', './storage/audio/')
-            
-            # Transcribe with Whisper (English only)
-            result = self.whisper_model.transcribe(
-                audio_path,
-                language="en",  # Force English language
-                task="transcribe"  # Transcribe (not translate)
-            )
-            
-            # Get transcript and duration
-            transcript = result["text"].strip()
-            
-            # Get duration from segments if available
-            duration = 0.0
-            if "segments" in result and result["segments"]:
-                last_segment = result["segments"][-1]
-                duration = last_segment.get("end", 0.0)
-            
-            # If duration not available, estimate from word count
-            if duration == 0.0:
-                word_count = len(transcript.split())
-                duration = (word_count / 150) * 60  # 150 words per minute
-            
-            return {
-                "text": transcript,
-                "duration": duration
-            }
-            
+            # Queue into the micro-batcher; it runs the model off the event loop
+            return await self._submit(audio_path)
+
         except Exception as e:
             print(f"❌ Whisper STT error: {e}")
             # Return mock data on error
@@ -137,6 +125,85 @@ class STTService:
                 "duration": 5.0
             }
     
+    async def _submit(self, audio_path: str) -> Dict[str, Any]:
+        """Enqueue a transcription request and wait for its result"""
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._drain_batches())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((audio_path, future))
+        return await future
+
+    async def _drain_batches(self):
+        """Background task: coalesce queued requests and run them in one thread hop"""
+        while True:
+            batch = [await self._batch_queue.get()]
+
+            # Collect whatever else arrives within the batching window
+            while len(batch) < self.BATCH_MAX_SIZE:
+                try:
+                    item = await asyncio.wait_for(
+                        self._batch_queue.get(),
+                        timeout=self.BATCH_WINDOW_SECONDS
+                    )
+                    batch.append(item)
+                except asyncio.TimeoutError:
+                    break
+
+            paths = [path for path, _ in batch]
+            results = await asyncio.to_thread(self._run_whisper_batch, paths)
+
+            for (_, future), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _run_whisper_batch(self, audio_paths):
+        """Run a batch of transcriptions on the shared model in one worker thread"""
+        results = []
+        for audio_path in audio_paths:
+            try:
+                results.append(self._run_whisper(audio_path))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _run_whisper(self, audio_path: str) -> Dict[str, Any]:
+        """Synchronous Whisper inference, called from a worker thread"""
+        # Transcribe with Whisper (English only); vad_filter skips silent frames
+        segments, info = self.whisper_model.transcribe(
+            audio_path,
+            language="en",  # Force English language
+            task="transcribe",  # Transcribe (not translate)
+            beam_size=1,
+            vad_filter=True
+        )
+
+        # Segments are generated lazily; collect transcript and end time
+        parts = []
+        duration = 0.0
+        for segment in segments:
+            parts.append(segment.text)
+            duration = segment.end
+
+        transcript = "".join(parts).strip()
+
+        # If duration not available, estimate from word count
+        if duration == 0.0:
+            duration = getattr(info, "duration", 0.0) or 0.0
+        if duration == 0.0:
+            word_count = len(transcript.split())
+            duration = (word_count / 150) * 60  # 150 words per minute
+
+        return {
+            "text": transcript,
+            "duration": duration
+        }
+
     def _fallback_transcript(self) -> Dict[str, Any]:
         """Fallback transcript if STT fails"""
         return {
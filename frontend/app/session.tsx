@@ -15,6 +15,19 @@ import { Audio } from 'expo-av';
 
 type SegmentKind = 'opening' | 'rebuttal' | 'closing';
 
+// Transcription runs in the background on the server; poll the segment
+// until it settles (roughly two minutes at 2s per attempt).
+const waitForTranscript = async (segmentId: number) => {
+  for (let attempt = 0; attempt < 60; attempt++) {
+    const segment = await apiClient.getSegment(segmentId);
+    if (segment.status !== 'pending') {
+      return segment;
+    }
+    await new Promise((resolve) => setTimeout(resolve, 2000));
+  }
+  throw new Error('Transcription timed out');
+};
+
 export default function SessionScreen() {
   const router = useRouter();
   const theme = useThemeStore((state) => state.theme);
@@ -106,9 +119,18 @@ export default function SessionScreen() {
       }
 
       const result = await uploadResponse.json();
-      
+
+      // The upload response comes back before transcription finishes, so
+      // poll until the transcript is ready
+      const segment =
+        result.status === 'pending' ? await waitForTranscript(result.segment_id) : result;
+
+      if (segment.status === 'failed') {
+        throw new Error('Transcription failed');
+      }
+
       setSegment(currentSegment, {
-        transcript: result.transcript,
+        transcript: segment.transcript,
         audioUrl: result.audio_url,
       });
 
@@ -181,7 +203,22 @@ export default function SessionScreen() {
 
     try {
       setIsScoringSession(true);
-      await apiClient.scoreSession(sessionId);
+      // Scoring returns 400 while a transcription is still in flight;
+      // retry for a bit instead of surfacing that as a failure
+      for (let attempt = 0; ; attempt++) {
+        try {
+          await apiClient.scoreSession(sessionId);
+          break;
+        } catch (err: any) {
+          const stillTranscribing =
+            err?.response?.status === 400 &&
+            err?.response?.data?.detail === 'Transcription still in progress';
+          if (!stillTranscribing || attempt >= 30) {
+            throw err;
+          }
+          await new Promise((resolve) => setTimeout(resolve, 2000));
+        }
+      }
       setIsScoringSession(false);
       router.push('/results');
     } catch (err) {
@@ -30,9 +30,10 @@ export interface SessionStartResponse {
 
 export interface SegmentUploadResponse {
   segment_id: number;
-  transcript: string;
+  transcript: string | null; // null while transcription is pending
   audio_url: string;
   duration: number;
+  status: 'pending' | 'done' | 'failed';
 }
 
 export interface ScoreBreakdown {
@@ -105,6 +106,12 @@ export const apiClient = {
     return response.data;
   },
 
+  // Get a segment's transcription status (poll after upload)
+  getSegment: async (segmentId: number): Promise<SegmentUploadResponse> => {
+    const response = await api.get(`/segment/${segmentId}`);
+    return response.data;
+  },
+
   // Score a session
   scoreSession: async (sessionId: string): Promise<ScoreResponse> => {
     const response = await api.post(`/session/score?session_id=${sessionId}`);